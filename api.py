@@ -0,0 +1,216 @@
+"""Read-only JSON API over the dashboard datasets.
+
+Serves the same aggregations the dashboard pages show (see views.py) from a
+small asyncio HTTP/1.1 server with keep-alive.  Responses are memoized per
+data version and filter set.  The ETag covers only the filters and result,
+so a result a data refresh left unchanged still revalidates as ``304 Not
+Modified``; the version itself is sent in the ``X-Data-Version`` header.
+
+    python api.py --port 8502
+    curl 'localhost:8502/totals?year=2022&quarter=1&state=kerala'
+
+Endpoints (all GET, all take year, quarter, state, txn_type):
+
+    /totals  /types  /states  /top-districts  /brands  /insurance-by-quarter  /version
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+
+from data_store import DataStore
+from views import (Filters, brand_share, filter_options, insurance_by_quarter, state_summary,
+                   top_districts, totals, type_breakdown)
+
+log = logging.getLogger(__name__)
+
+# path -> (aggregation, whether it reads the transaction type filter)
+ENDPOINTS = {
+    "/totals": (totals, True),
+    "/types": (type_breakdown, True),
+    "/states": (state_summary, False),
+    "/top-districts": (top_districts, False),
+    "/brands": (brand_share, False),
+    "/insurance-by-quarter": (insurance_by_quarter, False),
+}
+
+MAX_BODY = 1 << 20  # request bodies are ignored, but must still be read off the socket
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def parse_filters(data, params, uses_txn_type=True):
+    """``Filters`` from query parameters; year defaults to the latest one.
+
+    Only plain Python work: the allowed values are cached on the dataset, so
+    a cached response is found without touching pandas.
+    """
+    years, quarters, states, txn_types = filter_options(data)
+    try:
+        year = int(params.get("year", years[-1]))
+        quarter = params.get("quarter", "All")
+        quarter = quarter if quarter == "All" else int(quarter)
+    except ValueError:
+        raise BadRequest("year and quarter must be integers") from None
+    state = params.get("state", "All")
+    txn_type = params.get("txn_type", "All") if uses_txn_type else "All"
+
+    for name, value, allowed in [("year", year, years), ("quarter", quarter, quarters),
+                                 ("state", state, states), ("txn_type", txn_type, txn_types)]:
+        if value not in allowed:
+            raise BadRequest(f"unknown {name} {value!r}")
+    return Filters(year, quarter, state, txn_type)
+
+
+def _to_json(result):
+    if hasattr(result, "to_dict"):
+        # Round-trip through pandas so numpy scalars become plain JSON numbers
+        return json.loads(result.to_json(orient="records"))
+    return result
+
+
+class QueryAPI:
+    """Routes requests to ``views`` aggregations with a per-version response cache."""
+
+    def __init__(self, store, cache_size=4096):
+        self.store = store
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def _respond(self, data, path, params):
+        """``(status, body, etag)`` for a GET; cached results skip the aggregation."""
+        if path == "/version":
+            body = json.dumps({"version": data.version}).encode()
+            return 200, body, _etag(body)
+        if path not in ENDPOINTS:
+            raise LookupError(path)
+        func, uses_txn_type = ENDPOINTS[path]
+        f = parse_filters(data, params, uses_txn_type)
+
+        key = (data.version, path, f)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return (200, *self._cache[key])
+
+        body = json.dumps({
+            "filters": f._asdict(),
+            "data": _to_json(func(data, f)),
+        }, ensure_ascii=False).encode()
+        entry = self._cache[key] = (body, _etag(body))
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return (200, *entry)
+
+    def handle(self, method, target, headers):
+        """``(status, headers, body)`` for one request."""
+        if method not in ("GET", "HEAD"):
+            return 405, {"Allow": "GET, HEAD"}, b""
+        url = urlsplit(target)
+        data = self.store.current()
+        try:
+            status, body, etag = self._respond(data, url.path, dict(parse_qsl(url.query)))
+        except LookupError:
+            return _error(404, f"no endpoint {url.path}; try one of {sorted(ENDPOINTS)}")
+        except BadRequest as e:
+            return _error(400, str(e))
+
+        out = {"Content-Type": "application/json; charset=utf-8", "ETag": etag,
+               "Cache-Control": "no-cache", "X-Data-Version": data.version}
+        if etag in _split_etags(headers.get("if-none-match", "")):
+            return 304, out, b""
+        return status, out, body
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    method, keep_alive = None, False
+                    status, headers, body = _error(400, "malformed request line")
+                else:
+                    headers = dict(_header(line) for line in lines[1:] if ":" in line)
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                    try:
+                        length = int(headers.get("content-length", "0"))
+                        if not 0 <= length <= MAX_BODY:
+                            raise ValueError(length)
+                    except ValueError:
+                        keep_alive = False
+                        status, headers, body = _error(400, "invalid Content-Length")
+                    else:
+                        if length:
+                            await reader.readexactly(length)
+                        try:
+                            status, headers, body = self.handle(method, target, headers)
+                        except Exception:
+                            log.exception("error handling %s %s", method, target)
+                            status, headers, body = _error(500, "internal error")
+
+                headers["Content-Length"] = str(len(body))
+                if method == "HEAD":
+                    body = b""
+                headers["Connection"] = "keep-alive" if keep_alive else "close"
+                writer.write(_status_line(status) + "".join(f"{k}: {v}\r\n" for k, v in headers.items()).encode()
+                             + b"\r\n" + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+
+def _etag(body):
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def _split_etags(value):
+    return {tag.strip().removeprefix("W/") for tag in value.split(",") if tag.strip()}
+
+
+def _header(line):
+    name, _, value = line.partition(":")
+    return name.strip().lower(), value.strip()
+
+
+def _status_line(status):
+    return f"HTTP/1.1 {status} {REASONS[status]}\r\n".encode()
+
+
+def _error(status, message):
+    body = json.dumps({"error": message}).encode()
+    return status, {"Content-Type": "application/json; charset=utf-8"}, body
+
+
+async def serve(host="127.0.0.1", port=8502, data_dir=".", store=None):
+    api = QueryAPI(store or DataStore(data_dir))
+    server = await asyncio.start_server(api.serve_connection, host, port)
+    log.info("serving on %s", ", ".join(str(s.getsockname()) for s in server.sockets))
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read-only JSON API over the dashboard datasets.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--data-dir", default=".")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(serve(args.host, args.port, args.data_dir))
@@ -0,0 +1,367 @@
+"""Single-pass data-quality profile, accumulated while the parsers run.
+
+Each parser feeds every record it emits to a ``TableProfile`` before
+appending it, so row counts, nulls, duplicate keys, numeric summaries,
+per-(State, Year) quarter completeness and schema checks cost no extra passes
+over the DataFrames.  Profiles merge, so per-worker profiles from a parallel
+ingestion combine into one report.
+
+    run_profile = RunProfile()
+    profile = run_profile.table('Aggregated_transaction')
+    ...
+    profile.add(record)
+    ...
+    run_profile.save('quality_report.json')
+    run_profile.check({'max_schema_errors': 0})   # raises DataQualityError
+
+``python data_quality.py`` profiles the CSVs already on disk the same way.
+"""
+
+import argparse
+import csv
+import json
+import math
+import os
+import re
+from collections import defaultdict
+
+from derived_tables import BASE_TABLES
+from national import NATIONAL_TABLES
+
+# table -> (key columns, numeric columns). Keys identify a row; a repeated
+# key is a duplicate even if the measures differ.
+SCHEMAS = {
+    'Aggregated_transaction': (['State', 'Year', 'Quarter', 'Transaction_type'], ['Count', 'Amount']),
+    'Aggregated_user': (['State', 'Year', 'Quarter', 'Brand'], ['Count', 'Percentage']),
+    'Aggregated_insurance': (['State', 'Year', 'Quarter', 'Transaction_type'], ['Count', 'Amount']),
+    'Map_map': (['State', 'Year', 'Quarter', 'District'], ['Count', 'Amount']),
+    'Map_user': (['State', 'Year', 'Quarter', 'District'], ['RegisteredUsers', 'AppOpens']),
+    'Map_insurance': (['State', 'Year', 'Quarter', 'District'], ['Count', 'Amount']),
+    'Top_map': (['State', 'Year', 'Quarter', 'District'], ['Count', 'Amount']),
+    'Top_user': (['State', 'Year', 'Quarter', 'District'], ['RegisteredUsers']),
+    'Top_insurance': (['State', 'Year', 'Quarter', 'District'], ['Count', 'Amount']),
+    'Country_aggregated_transaction': (['Year', 'Quarter', 'Transaction_type'], ['Count', 'Amount']),
+    'Country_aggregated_user': (['Year', 'Quarter', 'Brand'], ['Count', 'Percentage']),
+    'Country_aggregated_insurance': (['Year', 'Quarter', 'Transaction_type'], ['Count', 'Amount']),
+    'Country_map_transaction': (['State', 'Year', 'Quarter'], ['Count', 'Amount']),
+    'Country_map_user': (['State', 'Year', 'Quarter'], ['RegisteredUsers', 'AppOpens']),
+    'Country_map_insurance': (['State', 'Year', 'Quarter'], ['Count', 'Amount']),
+    'Country_top_transaction': (['Year', 'Quarter', 'District'], ['Count', 'Amount']),
+    'Country_top_user': (['Year', 'Quarter', 'District'], ['RegisteredUsers']),
+    'Country_top_insurance': (['Year', 'Quarter', 'District'], ['Count', 'Amount']),
+}
+
+# CSV written for each profiled table (used when profiling from disk)
+CSV_FILES = {
+    **BASE_TABLES,
+    **{'Country_' + national.removeprefix('country_').removesuffix('.csv'): national
+       for national in NATIONAL_TABLES.values()},
+}
+
+QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+QUARTERS = {'1', '2', '3', '4'}
+YEAR_RE = re.compile(r'^\d{4}$')
+MAX_EXAMPLES = 5
+
+# Thresholds that fail a run; None disables a check.
+DEFAULT_THRESHOLDS = {
+    'max_schema_errors': 0,        # per table
+    'max_duplicate_keys': 0,       # per table
+    'max_null_fraction': None,     # per column, 0..1
+    'max_missing_quarters': None,  # per table, closed years only
+    'min_rows': 1,                 # per table
+}
+
+
+class DataQualityError(Exception):
+    """Raised by ``RunProfile.check`` with the list of threshold violations."""
+
+    def __init__(self, violations):
+        super().__init__("data quality check failed:\n  " + "\n  ".join(violations))
+        self.violations = violations
+
+
+def _is_null(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+class QuantileSketch:
+    """Mergeable compacting quantile sketch (a simplified KLL).
+
+    Each level holds items of weight ``2**level``; a full level is sorted and
+    every other item is promoted, so memory stays at about ``k * log2(n / k)``.
+    """
+
+    def __init__(self, k=128):
+        self.k = k
+        self.levels = [[]]
+        self._offset = 0
+
+    def add(self, value):
+        self.levels[0].append(value)
+        if len(self.levels[0]) >= self.k:
+            self._compress()
+
+    def merge(self, other):
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append([])
+            self.levels[h].extend(items)
+        self._compress()
+
+    def _compress(self):
+        for h in range(len(self.levels)):
+            if len(self.levels[h]) < self.k:
+                continue
+            if h + 1 == len(self.levels):
+                self.levels.append([])
+            items = sorted(self.levels[h])
+            # Alternate which half survives so the error doesn't drift one way
+            self.levels[h + 1].extend(items[self._offset::2])
+            self._offset ^= 1
+            self.levels[h] = []
+
+    def quantiles(self, qs):
+        weighted = sorted((v, 1 << h) for h, items in enumerate(self.levels) for v in items)
+        if not weighted:
+            return [None] * len(qs)
+        total = sum(w for _, w in weighted)
+        out, seen, i = [], 0, 0
+        for q in qs:
+            target = q * total
+            while i < len(weighted) - 1 and seen + weighted[i][1] <= target:
+                seen += weighted[i][1]
+                i += 1
+            out.append(weighted[i][0])
+        return out
+
+
+class NumericProfile:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        for attr, pick in (('min', min), ('max', max)):
+            values = [v for v in (getattr(self, attr), getattr(other, attr)) if v is not None]
+            setattr(self, attr, pick(values) if values else None)
+        self.sketch.merge(other.sketch)
+
+    def report(self):
+        return {
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else None,
+            'quantiles': dict(zip((f'p{round(q * 100):02d}' for q in QUANTILES),
+                                  self.sketch.quantiles(QUANTILES))),
+        }
+
+
+class TableProfile:
+    """Accumulates the quality profile of one table, one record at a time."""
+
+    def __init__(self, name, keys=None, numeric=None):
+        default_keys, default_numeric = SCHEMAS.get(name, ([], []))
+        self.name = name
+        self.keys = list(keys if keys is not None else default_keys)
+        self.numeric = list(numeric if numeric is not None else default_numeric)
+        self.columns = self.keys + self.numeric
+        self.rows = 0
+        self.nulls = defaultdict(int)
+        self.seen_keys = set()
+        self.duplicate_keys = 0
+        self.stats = {col: NumericProfile() for col in self.numeric}
+        self.quarters = defaultdict(set)  # (State, Year) -> quarters present
+        self.schema_errors = defaultdict(int)
+        self.examples = defaultdict(list)
+
+    def _schema_error(self, kind, example):
+        self.schema_errors[kind] += 1
+        if len(self.examples[kind]) < MAX_EXAMPLES:
+            self.examples[kind].append(example)
+
+    def add(self, record):
+        self.rows += 1
+
+        missing = [c for c in self.columns if c not in record]
+        if missing:
+            self._schema_error('missing_columns', missing)
+        extra = [c for c in record if c not in self.columns]
+        if extra:
+            self._schema_error('unexpected_columns', extra)
+
+        for col in self.columns:
+            if _is_null(record.get(col)):
+                self.nulls[col] += 1
+
+        key = tuple(record.get(c) for c in self.keys)
+        if key in self.seen_keys:
+            self.duplicate_keys += 1
+        else:
+            self.seen_keys.add(key)
+
+        year, quarter = str(record.get('Year')), str(record.get('Quarter'))
+        if 'Year' in self.columns and not YEAR_RE.match(year):
+            self._schema_error('bad_year', year)
+        if 'Quarter' in self.columns:
+            if quarter in QUARTERS:
+                self.quarters[(str(record.get('State', 'india')), year)].add(quarter)
+            else:
+                # e.g. a file name mangled by the parser
+                self._schema_error('bad_quarter', quarter)
+
+        for col in self.numeric:
+            value = record.get(col)
+            if _is_null(value):
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                self._schema_error(f'non_numeric_{col}', repr(value))
+                continue
+            self.stats[col].add(value)
+
+    def merge(self, other):
+        """Fold in a profile of the same table built by another worker."""
+        self.rows += other.rows
+        for col, n in other.nulls.items():
+            self.nulls[col] += n
+        self.duplicate_keys += other.duplicate_keys + len(self.seen_keys & other.seen_keys)
+        self.seen_keys |= other.seen_keys
+        for col, stats in other.stats.items():
+            self.stats[col].merge(stats)
+        for key, quarters in other.quarters.items():
+            self.quarters[key] |= quarters
+        for kind, n in other.schema_errors.items():
+            self.schema_errors[kind] += n
+            self.examples[kind] = (self.examples[kind] + other.examples[kind])[:MAX_EXAMPLES]
+
+    def missing_quarters(self):
+        """``{"state/year": [missing quarters]}``, skipping the latest (still open) year."""
+        years = [y for _, y in self.quarters if YEAR_RE.match(y)]
+        latest = max(years) if years else None
+        return {f"{state}/{year}": sorted(QUARTERS - quarters)
+                for (state, year), quarters in sorted(self.quarters.items())
+                if year != latest and quarters != QUARTERS}
+
+    def report(self):
+        return {
+            'rows': self.rows,
+            'nulls': {col: self.nulls.get(col, 0) for col in self.columns},
+            'duplicate_keys': self.duplicate_keys,
+            'numeric': {col: stats.report() for col, stats in self.stats.items()},
+            'missing_quarters': self.missing_quarters(),
+            'schema_errors': dict(self.schema_errors),
+            'schema_error_examples': dict(self.examples),
+        }
+
+
+class RunProfile:
+    """The profiles of every table ingested in one run."""
+
+    def __init__(self):
+        self.tables = {}
+
+    def table(self, name):
+        if name not in self.tables:
+            self.tables[name] = TableProfile(name)
+        return self.tables[name]
+
+    def merge(self, other):
+        for name, profile in other.tables.items():
+            if name in self.tables:
+                self.tables[name].merge(profile)
+            else:
+                self.tables[name] = profile
+
+    def report(self):
+        return {'tables': {name: p.report() for name, p in self.tables.items()}}
+
+    def save(self, path):
+        tmp = f"{path}.tmp.{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(self.report(), f, indent=2, default=str)
+        os.replace(tmp, path)
+
+    def violations(self, thresholds=None):
+        t = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        found = []
+        for name, p in self.tables.items():
+            errors = sum(p.schema_errors.values())
+            if t['max_schema_errors'] is not None and errors > t['max_schema_errors']:
+                found.append(f"{name}: {errors} schema errors {dict(p.schema_errors)}")
+            if t['max_duplicate_keys'] is not None and p.duplicate_keys > t['max_duplicate_keys']:
+                found.append(f"{name}: {p.duplicate_keys} duplicate keys on {p.keys}")
+            if t['min_rows'] is not None and p.rows < t['min_rows']:
+                found.append(f"{name}: only {p.rows} rows")
+            if t['max_null_fraction'] is not None and p.rows:
+                for col in p.columns:
+                    if p.nulls.get(col, 0) / p.rows > t['max_null_fraction']:
+                        found.append(f"{name}.{col}: {p.nulls[col]}/{p.rows} nulls")
+            missing = p.missing_quarters()
+            if t['max_missing_quarters'] is not None and len(missing) > t['max_missing_quarters']:
+                found.append(f"{name}: {len(missing)} state/years missing quarters")
+        return found
+
+    def check(self, thresholds=None):
+        found = self.violations(thresholds)
+        if found:
+            raise DataQualityError(found)
+
+
+def _number(value):
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value  # reported as a schema error
+
+
+def profile_csvs(data_dir="."):
+    """Profile the CSVs already on disk, streaming rows with the csv module."""
+    run = RunProfile()
+    for name, filename in CSV_FILES.items():
+        path = os.path.join(data_dir, filename)
+        if not os.path.exists(path):
+            continue
+        profile = run.table(name)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                for col in profile.numeric:
+                    row[col] = _number(row.get(col))
+                profile.add(row)
+    return run
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the ingested CSVs in one pass.")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--out", default=None, help="write the JSON report here")
+    parser.add_argument("--thresholds", default=None, help="JSON file of thresholds to enforce")
+    args = parser.parse_args()
+
+    run = profile_csvs(args.data_dir)
+    if args.out:
+        run.save(args.out)
+    else:
+        print(json.dumps(run.report(), indent=2, default=str))
+    thresholds = None
+    if args.thresholds:
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    violations = run.violations(thresholds)
+    for violation in violations:
+        print("FAIL", violation)
+    raise SystemExit(1 if violations else 0)
@@ -0,0 +1,175 @@
+"""Versioned, hot-reloadable data layer for the dashboard.
+
+``phone_pe.py`` writes the ``DATA_VERSION`` marker atomically once a run has
+finished writing its CSVs.  A ``DataStore`` polls that marker from a
+background thread, loads the new version off the request path and swaps it in
+with a single reference assignment.  Each rerun grabs ``store.current()``
+once, so renders already in flight finish on the snapshot they started with.
+
+Without a marker the version falls back to the size/mtime of the CSVs, and a
+change must be seen on two consecutive polls before it is loaded, so a
+half-written export is not picked up.  A new version only goes live if every
+base table is non-empty and has its columns (see ``validate_dataset``);
+otherwise the old one keeps serving.
+"""
+
+import hashlib
+import logging
+from functools import cached_property
+import os
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from data_quality import SCHEMAS
+from derived_tables import BASE_TABLES
+from memory import compact
+from national import load_national
+
+VERSION_FILE = "DATA_VERSION"
+STAT_PREFIX = "stat-"
+
+# Base CSVs the dashboard reads, as written by phone_pe.py
+TABLES = list(BASE_TABLES.values())
+
+log = logging.getLogger(__name__)
+
+
+def write_version(data_dir=".", version=None):
+    """Atomically publish a new data version; call after every CSV is written."""
+    version = version or f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(data_dir, VERSION_FILE)
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "w") as f:
+        f.write(version + "\n")
+    os.replace(tmp, path)
+    return version
+
+
+def current_version(data_dir="."):
+    """The published version marker, or a signature of the CSVs on disk."""
+    try:
+        with open(os.path.join(data_dir, VERSION_FILE)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+    h = hashlib.sha256()
+    for name in sorted(os.listdir(data_dir)):
+        if name.endswith(".csv"):
+            st = os.stat(os.path.join(data_dir, name))
+            h.update(f"{name}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return STAT_PREFIX + h.hexdigest()[:16]
+
+
+class Dataset:
+    """An immutable snapshot of every table the dashboard reads."""
+
+    def __init__(self, version, tables, national, dictionary=None):
+        self.version = version
+        self.tables = tables
+        self.national = national
+        self.dictionary = dictionary
+
+    def __getitem__(self, filename):
+        return self.tables[filename]
+
+    @cached_property
+    def filter_options(self):
+        """Sidebar choices: ``(years, quarters, states, transaction types)``, as plain Python values."""
+        df_tr = self.tables["aggregated_transaction.csv"]
+        return (sorted(int(y) for y in df_tr['Year'].unique()),
+                ["All"] + sorted(int(q) for q in df_tr['Quarter'].unique()),
+                ["All"] + sorted(df_tr['State'].unique()),
+                ["All"] + sorted(df_tr['Transaction_type'].unique()))
+
+
+def load_dataset(data_dir="."):
+    version = current_version(data_dir)
+    tables = {name: pd.read_csv(os.path.join(data_dir, name)) for name in TABLES}
+    national = load_national(data_dir)
+
+    # Every table shares one string dictionary; see memory.py
+    compacted, dictionary = compact({**tables, **{("national", k): v for k, v in national.items()}})
+    tables = {name: compacted[name] for name in tables}
+    national = {name: compacted[("national", name)] for name in national}
+    return Dataset(version, tables, national, dictionary)
+
+
+def validate_dataset(dataset):
+    """Raise ``ValueError`` unless every base table is usable by the dashboard.
+
+    Each table must be non-empty, have its schema columns (see
+    data_quality.SCHEMAS), no missing keys, and numeric measures; a malformed
+    row appended to a CSV fails at least one of these.
+    """
+    problems = []
+    for name, filename in BASE_TABLES.items():
+        df = dataset.tables.get(filename)
+        if df is None or df.empty:
+            problems.append(f"{filename}: no rows")
+            continue
+        keys, numeric = SCHEMAS[name]
+        missing = [c for c in keys + numeric if c not in df.columns]
+        if missing:
+            problems.append(f"{filename}: missing columns {missing}")
+            continue
+        null_keys = [c for c in keys if df[c].isna().any()]
+        if null_keys:
+            problems.append(f"{filename}: missing values in {null_keys}")
+        not_numeric = [c for c in ["Year", "Quarter", *numeric] if not pd.api.types.is_numeric_dtype(df[c])]
+        if not_numeric:
+            problems.append(f"{filename}: non-numeric {not_numeric}")
+    if problems:
+        raise ValueError(f"data version {dataset.version} is invalid: " + "; ".join(problems))
+
+
+class DataStore:
+    """Holds the current ``Dataset`` and swaps in new versions in the background."""
+
+    def __init__(self, data_dir=".", poll_interval=2.0, loader=load_dataset):
+        self.data_dir = data_dir
+        self.poll_interval = poll_interval
+        self._loader = loader
+        self._dataset = loader(data_dir)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name="data-store-watch", daemon=True)
+        self._thread.start()
+
+    def current(self):
+        return self._dataset
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _watch(self):
+        last_seen = self._dataset.version
+        rejected = None
+        while not self._stop.wait(self.poll_interval):
+            try:
+                version = current_version(self.data_dir)
+            except OSError:
+                log.exception("could not read data version")
+                continue
+            # The marker is written atomically; only a stat signature needs to settle
+            settled = version == last_seen or not version.startswith(STAT_PREFIX)
+            last_seen = version
+            if version in (self._dataset.version, rejected) or not settled:
+                continue
+            try:
+                dataset = self._loader(self.data_dir)
+            except Exception:
+                # Keep serving the old version; the next poll retries.
+                log.exception("failed to load data version %s", version)
+                continue
+            try:
+                validate_dataset(dataset)
+            except ValueError:
+                # Retrying won't help until a new version is published
+                log.exception("keeping data version %s", self._dataset.version)
+                rejected = version
+                continue
+            self._dataset = dataset
+            log.info("data version %s is live", dataset.version)
@@ -0,0 +1,278 @@
+"""Derived business-case tables (the ``df_*.csv`` snapshots).
+
+Each derived table is declared as a node with the tables it reads and the
+SQL that produces it.  Nodes are fingerprinted from the content hashes of
+their inputs, so a refresh only recomputes the tables whose inputs actually
+changed.  Independent stale nodes are rebuilt in parallel.
+
+    python derived_tables.py                # rebuild stale tables in "."
+    python derived_tables.py --force -j 4   # rebuild everything
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+# SQL table name -> CSV written by phone_pe.py
+BASE_TABLES = {
+    "Aggregated_transaction": "aggregated_transaction.csv",
+    "Aggregated_user": "aggregated_user.csv",
+    "Aggregated_insurance": "aggregated_insurance.csv",
+    "Map_map": "map_transaction.csv",
+    "Map_user": "map_user.csv",
+    "Map_insurance": "map_insurance.csv",
+    "Top_map": "top_transaction.csv",
+    "Top_user": "top_user.csv",
+    "Top_insurance": "top_insurance.csv",
+}
+
+MANIFEST_FILE = "derived_manifest.json"
+
+
+class Node:
+    """A derived table: ``query`` runs over ``inputs`` and is saved as ``<name>.csv``.
+
+    ``inputs`` may name base tables or other derived nodes.  ``post`` is an
+    optional pandas step applied to the query result.
+    """
+
+    def __init__(self, name, inputs, query, post=None):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.query = query
+        self.post = post
+
+    @property
+    def filename(self):
+        return f"{self.name}.csv"
+
+
+def _engagement_ratio(df):
+    df['Engagement_Ratio'] = df['Total_AppOpens'] / df['Total_Users']
+    return df
+
+
+NODES = {node.name: node for node in [
+    # Decoding Transaction Dynamics
+    Node("df_transaction_dynamics", ["Aggregated_transaction"], '''
+SELECT
+    State,
+    Year,
+    Quarter,
+    Transaction_type,
+    SUM(Count) AS Total_Transactions,
+    SUM(Amount) AS Total_Amount
+FROM Aggregated_transaction
+GROUP BY State, Year, Quarter, Transaction_type
+ORDER BY Year, Quarter
+'''),
+    # Device Dominance & User Engagement
+    Node("df_device_dominance", ["Aggregated_user"], '''
+SELECT
+    State,
+    Year,
+    Quarter,
+    Brand,
+    SUM(Count) AS Registered_Users,
+    ROUND(AVG(Percentage), 2) AS Avg_Percentage
+FROM Aggregated_user
+GROUP BY State, Year, Quarter, Brand
+ORDER BY Registered_Users DESC
+'''),
+    # Insurance Penetration & Growth Potential
+    Node("df_insurance_growth", ["Aggregated_insurance"], '''
+SELECT
+    State,
+    Year,
+    Quarter,
+    Transaction_type,
+    SUM(Count) AS Insurance_Count,
+    SUM(Amount) AS Insurance_Amount
+FROM Aggregated_insurance
+GROUP BY State, Year, Quarter, Transaction_type
+ORDER BY Year, Quarter
+'''),
+    # User Engagement and Growth Strategy
+    Node("df_user_engagement", ["Map_user"], '''
+SELECT
+    State,
+    SUM(RegisteredUsers) AS Total_Users,
+    SUM(AppOpens) AS Total_AppOpens
+FROM Map_user
+GROUP BY State
+ORDER BY Total_AppOpens DESC
+''', post=_engagement_ratio),
+    # Transaction Analysis Across States and Districts
+    Node("df_top_districts", ["Top_map"], '''
+SELECT
+    State,
+    District,
+    SUM(Amount) AS Total_Amount,
+    SUM(Count) AS Total_Transactions
+FROM Top_map
+GROUP BY State, District
+ORDER BY Total_Amount DESC
+LIMIT 20
+'''),
+]}
+
+
+def _input_path(data_dir, table):
+    if table in BASE_TABLES:
+        return os.path.join(data_dir, BASE_TABLES[table])
+    return os.path.join(data_dir, NODES[table].filename)
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _topo_order(nodes):
+    order, seen = [], set()
+
+    def visit(name, stack=()):
+        if name in seen or name in BASE_TABLES:
+            return
+        if name in stack:
+            raise ValueError(f"cycle in derived tables: {' -> '.join(stack + (name,))}")
+        if name not in NODES:
+            raise KeyError(f"unknown table {name!r}")
+        for dep in NODES[name].inputs:
+            visit(dep, stack + (name,))
+        seen.add(name)
+        order.append(name)
+
+    for name in nodes:
+        visit(name)
+    return order
+
+
+def _code_fingerprint(func):
+    # Editing a post step's body must make its node stale, not just renaming it
+    try:
+        return inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        code = func.__code__
+        return code.co_code + repr(code.co_consts).encode()
+
+
+def fingerprints(data_dir=".", nodes=None):
+    """Fingerprint every node from its query and its inputs' fingerprints.
+
+    Base tables are fingerprinted by file content, so a derived node's
+    fingerprint is known before anything is rebuilt.
+    """
+    order = _topo_order(nodes or NODES)
+    fps = {}
+    for name in order:
+        node = NODES[name]
+        h = hashlib.sha256(node.query.encode())
+        if node.post is not None:
+            h.update(_code_fingerprint(node.post))
+        for table in node.inputs:
+            if table not in fps:
+                fps[table] = file_hash(_input_path(data_dir, table))
+            h.update(f"{table}={fps[table]}".encode())
+        fps[name] = h.hexdigest()
+    return {name: fps[name] for name in order}
+
+
+def load_manifest(data_dir="."):
+    try:
+        with open(os.path.join(data_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(manifest, data_dir="."):
+    def write(path):
+        with open(path, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+    _write_atomic(os.path.join(data_dir, MANIFEST_FILE), write)
+
+
+def _write_atomic(path, write):
+    tmp = f"{path}.tmp.{os.getpid()}"
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def stale_nodes(data_dir=".", nodes=None, fps=None):
+    fps = fps or fingerprints(data_dir, nodes)
+    manifest = load_manifest(data_dir)
+    return [name for name, fp in fps.items()
+            if manifest.get(name) != fp
+            or not os.path.exists(os.path.join(data_dir, NODES[name].filename))]
+
+
+def build_node(name, data_dir="."):
+    """Run one node's query over its inputs and write ``<name>.csv``."""
+    node = NODES[name]
+    engine = create_engine('sqlite://', echo=False)
+    for table in node.inputs:
+        pd.read_csv(_input_path(data_dir, table)).to_sql(table, con=engine, if_exists='replace', index=False)
+    df = pd.read_sql_query(node.query, engine)
+    engine.dispose()
+    if node.post is not None:
+        df = node.post(df)
+    _write_atomic(os.path.join(data_dir, node.filename), lambda p: df.to_csv(p, index=False))
+    return df
+
+
+def refresh(data_dir=".", nodes=None, force=False, max_workers=None):
+    """Rebuild stale derived tables; returns ``{name: "rebuilt" | "fresh"}``."""
+    fps = fingerprints(data_dir, nodes)
+    stale = set(fps) if force else set(stale_nodes(data_dir, fps=fps))
+    status = {name: "fresh" for name in fps if name not in stale}
+    manifest = load_manifest(data_dir)
+
+    # A stale node waits only for stale inputs; fresh ones are already on disk.
+    pending = {name: {d for d in NODES[name].inputs if d in stale} for name in stale}
+    running = {}
+    error = None
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            if error is None:
+                for name in [n for n, deps in pending.items() if not deps]:
+                    del pending[name]
+                    running[pool.submit(build_node, name, data_dir)] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                manifest[name] = fps[name]
+                status[name] = "rebuilt"
+                for deps in pending.values():
+                    deps.discard(name)
+
+    save_manifest(manifest, data_dir)
+    if error is not None:
+        raise error
+    return {name: status[name] for name in fps}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild stale derived df_*.csv tables.")
+    parser.add_argument("nodes", nargs="*", help="derived tables to refresh (default: all)")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    for name, state in refresh(args.data_dir, args.nodes or None, args.force, args.jobs).items():
+        print(f"{state:8} {name}")
@@ -0,0 +1,110 @@
+"""Shared string dictionary for the dashboard tables, and a memory report.
+
+The tables repeat the same State, District, Brand and Transaction_type names
+hundreds of thousands of times.  ``StringDictionary`` collects every distinct
+name across all tables into one ``CategoricalDtype``; encoded columns share
+that single categories index and only hold small integer codes.
+
+    python memory.py report                 # per-table/column bytes, before and after
+    python memory.py report --data-dir out
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+STRING_COLUMNS = ["State", "District", "Brand", "Transaction_type"]
+
+
+class StringDictionary:
+    """One sorted set of names, shared by every encoded column."""
+
+    def __init__(self, values):
+        self.dtype = pd.CategoricalDtype(sorted(set(values)))
+
+    @classmethod
+    def from_tables(cls, tables, columns=STRING_COLUMNS):
+        values = set()
+        for df in tables:
+            for col in columns:
+                if col in df.columns:
+                    values.update(df[col].dropna().unique())
+        return cls(values)
+
+    def __len__(self):
+        return len(self.dtype.categories)
+
+    @property
+    def nbytes(self):
+        return int(self.dtype.categories.memory_usage(deep=True))
+
+    def encode(self, df, columns=STRING_COLUMNS):
+        """A copy of ``df`` with ``columns`` stored as codes into this dictionary."""
+        encoded = {col: df[col].astype(self.dtype) for col in columns if col in df.columns}
+        return df.assign(**encoded) if encoded else df
+
+
+def compact(tables, columns=STRING_COLUMNS):
+    """Encode every table in ``{name: DataFrame}`` against one shared dictionary.
+
+    Returns ``(compacted tables, dictionary)``.
+    """
+    dictionary = StringDictionary.from_tables(tables.values(), columns)
+    return {name: dictionary.encode(df, columns) for name, df in tables.items()}, dictionary
+
+
+def column_bytes(df, dictionary=None):
+    """``{column: bytes}``; columns using ``dictionary`` are charged for their codes only."""
+    usage = {}
+    for col in df.columns:
+        s = df[col]
+        if dictionary is not None and isinstance(s.dtype, pd.CategoricalDtype) \
+                and s.cat.categories is dictionary.dtype.categories:
+            usage[col] = int(s.cat.codes.memory_usage(index=False))
+        else:
+            usage[col] = int(s.memory_usage(index=False, deep=True))
+    return usage
+
+
+def memory_report(tables, compacted=None, dictionary=None):
+    """Per-table, per-column bytes before and after compaction, as a DataFrame."""
+    if compacted is None:
+        compacted, dictionary = compact(tables)
+    rows = []
+    for name, df in tables.items():
+        after = column_bytes(compacted[name], dictionary)
+        for col, before in column_bytes(df).items():
+            rows.append({"Table": name, "Column": col, "Before": before, "After": after[col]})
+    if dictionary is not None:
+        rows.append({"Table": "(shared dictionary)", "Column": f"{len(dictionary)} names",
+                     "Before": 0, "After": dictionary.nbytes})
+    return pd.DataFrame(rows)
+
+
+def _fmt(n):
+    return f"{n / 2**20:,.2f} MiB" if n >= 2**20 else f"{n / 2**10:,.1f} KiB"
+
+
+def print_report(report):
+    for table, rows in report.groupby("Table", sort=False):
+        print(f"\n{table}")
+        for row in rows.itertuples():
+            print(f"  {row.Column:20} {_fmt(row.Before):>12} -> {_fmt(row.After):>12}")
+    before, after = report["Before"].sum(), report["After"].sum()
+    print(f"\nTotal {_fmt(before)} -> {_fmt(after)} ({after / before:.1%})")
+
+
+if __name__ == "__main__":
+    from data_store import TABLES
+    from national import load_national
+
+    parser = argparse.ArgumentParser(description="Dashboard memory footprint tools.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report_cmd = sub.add_parser("report", help="print per-table and per-column byte usage")
+    report_cmd.add_argument("--data-dir", default=".")
+    args = parser.parse_args()
+
+    tables = {name: pd.read_csv(os.path.join(args.data_dir, name)) for name in TABLES}
+    tables.update({f"national/{name}": df for name, df in load_national(args.data_dir).items()})
+    print_report(memory_report(tables))
@@ -0,0 +1,97 @@
+"""National (country/india) partitions and the sum-of-states consistency check.
+
+Pulse publishes all-India files next to the per-state ones.  ``phone_pe.py``
+writes them as ``country_*.csv`` so the dashboard can answer "All" states
+views from a single partition instead of summing 36 states.
+
+    python national.py              # report states-vs-national divergence
+    python national.py --rtol 0.01
+"""
+
+import argparse
+import os
+
+import pandas as pd
+
+# state-level CSV -> national CSV
+NATIONAL_TABLES = {
+    "aggregated_transaction.csv": "country_aggregated_transaction.csv",
+    "aggregated_user.csv": "country_aggregated_user.csv",
+    "aggregated_insurance.csv": "country_aggregated_insurance.csv",
+    "map_transaction.csv": "country_map_transaction.csv",
+    "map_user.csv": "country_map_user.csv",
+    "map_insurance.csv": "country_map_insurance.csv",
+    "top_transaction.csv": "country_top_transaction.csv",
+    "top_user.csv": "country_top_user.csv",
+    "top_insurance.csv": "country_top_insurance.csv",
+}
+
+# (state-level CSV, keys the national file is reported at, values to compare).
+# Top files are top-10 lists at both levels, so their sums are not comparable.
+CONSISTENCY_CHECKS = [
+    ("aggregated_transaction.csv", ["Year", "Quarter", "Transaction_type"], ["Count", "Amount"]),
+    ("aggregated_user.csv", ["Year", "Quarter", "Brand"], ["Count"]),
+    ("aggregated_insurance.csv", ["Year", "Quarter", "Transaction_type"], ["Count", "Amount"]),
+    ("map_transaction.csv", ["State", "Year", "Quarter"], ["Count", "Amount"]),
+    ("map_user.csv", ["State", "Year", "Quarter"], ["RegisteredUsers", "AppOpens"]),
+    ("map_insurance.csv", ["State", "Year", "Quarter"], ["Count", "Amount"]),
+]
+
+
+def load_national(data_dir="."):
+    """Return ``{state-level CSV: national DataFrame}`` for the partitions on disk."""
+    frames = {}
+    for filename, national in NATIONAL_TABLES.items():
+        path = os.path.join(data_dir, national)
+        if os.path.exists(path):
+            frames[filename] = pd.read_csv(path)
+    return frames
+
+
+def check_consistency(df_states, df_national, keys, values, rtol=0.005):
+    """Rows where the sum of states differs from the national figure by more than ``rtol``.
+
+    Keys present on only one side are reported too (the missing side is NaN).
+    """
+    states = df_states.groupby(keys)[values].sum()
+    national = df_national.groupby(keys)[values].sum()
+    merged = states.join(national, how="outer", lsuffix="_states", rsuffix="_national")
+
+    diverged = pd.Series(False, index=merged.index)
+    for col in values:
+        s, n = merged[f"{col}_states"], merged[f"{col}_national"]
+        merged[f"{col}_diff_pct"] = (s - n) / n.abs() * 100
+        diverged |= (s - n).abs() > rtol * n.abs()
+        diverged |= s.isna() != n.isna()
+    return merged[diverged].reset_index()
+
+
+def check_all(data_dir=".", rtol=0.005):
+    """Run every consistency check whose national partition exists.
+
+    Returns ``{state-level CSV: divergent rows}``; an empty frame means consistent.
+    """
+    national = load_national(data_dir)
+    report = {}
+    for filename, keys, values in CONSISTENCY_CHECKS:
+        if filename not in national:
+            continue
+        df_states = pd.read_csv(os.path.join(data_dir, filename))
+        report[filename] = check_consistency(df_states, national[filename], keys, values, rtol)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sum-of-states against Pulse's national files.")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("--rtol", type=float, default=0.005, help="relative tolerance (default 0.5%%)")
+    args = parser.parse_args()
+
+    report = check_all(args.data_dir, args.rtol)
+    if not report:
+        print("No national partitions found; run phone_pe.py to ingest country/india files.")
+    for filename, diverged in report.items():
+        print(f"{filename}: {len(diverged)} divergent rows")
+        if not diverged.empty:
+            print(diverged.to_string(index=False))
+    raise SystemExit(1 if any(not d.empty for d in report.values()) else 0)
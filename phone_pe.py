@@ -53,16 +53,25 @@ import pandas as pd
 from sqlalchemy import create_engine
 from pandas import json_normalize
 from tqdm import tqdm
+from derived_tables import BASE_TABLES, NODES, refresh as refresh_derived_tables
+from national import NATIONAL_TABLES, check_all as check_national_consistency
+from data_store import write_version
+from data_quality import RunProfile
 
 # Setup
 base_path = "/content/pulse/data"
 engine = create_engine('sqlite://', echo=False)
 
+# Data-quality profile, filled in by the parsers as records stream out (see data_quality.py)
+run_profile = RunProfile()
+quality_thresholds = {'max_schema_errors': 0, 'max_duplicate_keys': 0}
+
 #Aggregated Transaction
 
 def parse_aggregated_transaction():
     path = os.path.join(base_path, 'aggregated/transaction/country/india/state')
     data = []
+    profile = run_profile.table('Aggregated_transaction')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -71,14 +80,16 @@ def parse_aggregated_transaction():
                     with open(os.path.join(path, state, year, file)) as f:
                         content = json.load(f)
                         for txn in content['data']['transactionData']:
-                            data.append({
+                            record = {
                                 'State': state,
                                 'Year': year,
-                                'Quarter': file.strip('.json'),
+                                'Quarter': os.path.splitext(file)[0],
                                 'Transaction_type': txn['name'],
                                 'Count': txn['paymentInstruments'][0]['count'],
                                 'Amount': txn['paymentInstruments'][0]['amount']
-                            })
+                            }
+                            profile.add(record)
+                            data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Aggregated_transaction', con=engine, if_exists='replace', index=False)
@@ -89,6 +100,7 @@ def parse_aggregated_transaction():
 def parse_aggregated_user():
     path = os.path.join(base_path, 'aggregated/user/country/india/state')
     data = []
+    profile = run_profile.table('Aggregated_user')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -98,14 +110,16 @@ def parse_aggregated_user():
                         content = json.load(f)
                         if content['data']['usersByDevice']:
                             for user in content['data']['usersByDevice']:
-                                data.append({
+                                record = {
                                     'State': state,
                                     'Year': year,
-                                    'Quarter': file.strip('.json'),
+                                    'Quarter': os.path.splitext(file)[0],
                                     'Brand': user['brand'],
                                     'Count': user['count'],
                                     'Percentage': user['percentage']
-                                })
+                                }
+                                profile.add(record)
+                                data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Aggregated_user', con=engine, if_exists='replace', index=False)
@@ -116,6 +130,7 @@ def parse_aggregated_user():
 def parse_aggregated_insurance():
     path = os.path.join(base_path, 'aggregated/insurance/country/india/state')
     data = []
+    profile = run_profile.table('Aggregated_insurance')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -124,14 +139,16 @@ def parse_aggregated_insurance():
                     with open(os.path.join(path, state, year, file)) as f:
                         content = json.load(f)
                         for txn in content['data']['transactionData']:
-                            data.append({
+                            record = {
                                 'State': state,
                                 'Year': year,
-                                'Quarter': file.strip('.json'),
+                                'Quarter': os.path.splitext(file)[0],
                                 'Transaction_type': txn['name'],
                                 'Count': txn['paymentInstruments'][0]['count'],
                                 'Amount': txn['paymentInstruments'][0]['amount']
-                            })
+                            }
+                            profile.add(record)
+                            data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Aggregated_insurance', con=engine, if_exists='replace', index=False)
@@ -142,6 +159,7 @@ def parse_aggregated_insurance():
 def parse_map_transaction():
     path = os.path.join(base_path, 'map/transaction/hover/country/india/state')
     data = []
+    profile = run_profile.table('Map_map')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -150,14 +168,16 @@ def parse_map_transaction():
                     with open(os.path.join(path, state, year, file)) as f:
                         content = json.load(f)
                         for district in content['data']['hoverDataList']:
-                            data.append({
+                            record = {
                                 'State': state,
                                 'Year': year,
-                                'Quarter': file.strip('.json'),
+                                'Quarter': os.path.splitext(file)[0],
                                 'District': district['name'],
                                 'Count': district['metric'][0]['count'],
                                 'Amount': district['metric'][0]['amount']
-                            })
+                            }
+                            profile.add(record)
+                            data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Map_map', con=engine, if_exists='replace', index=False)
@@ -168,6 +188,7 @@ def parse_map_transaction():
 def parse_map_user():
     path = os.path.join(base_path, 'map/user/hover/country/india/state')
     data = []
+    profile = run_profile.table('Map_user')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -177,14 +198,16 @@ def parse_map_user():
                         content = json.load(f)
                         for district in content['data']['hoverData'].keys():
                             dist_data = content['data']['hoverData'][district]
-                            data.append({
+                            record = {
                                 'State': state,
                                 'Year': year,
-                                'Quarter': file.strip('.json'),
+                                'Quarter': os.path.splitext(file)[0],
                                 'District': district,
                                 'RegisteredUsers': dist_data['registeredUsers'],
                                 'AppOpens': dist_data.get('appOpens', None)
-                            })
+                            }
+                            profile.add(record)
+                            data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Map_user', con=engine, if_exists='replace', index=False)
@@ -195,6 +218,7 @@ def parse_map_user():
 def parse_map_insurance():
     path = os.path.join(base_path, 'map/insurance/hover/country/india/state')
     data = []
+    profile = run_profile.table('Map_insurance')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -203,14 +227,16 @@ def parse_map_insurance():
                     with open(os.path.join(path, state, year, file)) as f:
                         content = json.load(f)
                         for district in content['data']['hoverDataList']:
-                            data.append({
+                            record = {
                                 'State': state,
                                 'Year': year,
-                                'Quarter': file.strip('.json'),
+                                'Quarter': os.path.splitext(file)[0],
                                 'District': district['name'],
                                 'Count': district['metric'][0]['count'],
                                 'Amount': district['metric'][0]['amount']
-                            })
+                            }
+                            profile.add(record)
+                            data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Map_insurance', con=engine, if_exists='replace', index=False)
@@ -223,6 +249,7 @@ def parse_map_insurance():
 def parse_top_transaction():
     path = os.path.join(base_path, 'top/transaction/country/india/state')
     data = []
+    profile = run_profile.table('Top_map')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -231,14 +258,16 @@ def parse_top_transaction():
                     with open(os.path.join(path, state, year, file)) as f:
                         content = json.load(f)
                         for entry in content['data']['districts']:
-                            data.append({
+                            record = {
                                 'State': state,
                                 'Year': year,
-                                'Quarter': file.strip('.json'),
+                                'Quarter': os.path.splitext(file)[0],
                                 'District': entry['entityName'],
                                 'Count': entry['metric']['count'],
                                 'Amount': entry['metric']['amount']
-                            })
+                            }
+                            profile.add(record)
+                            data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Top_map', con=engine, if_exists='replace', index=False)
@@ -249,6 +278,7 @@ def parse_top_transaction():
 def parse_top_user():
     path = os.path.join(base_path, 'top/user/country/india/state')
     data = []
+    profile = run_profile.table('Top_user')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -257,13 +287,15 @@ def parse_top_user():
                     with open(os.path.join(path, state, year, file)) as f:
                         content = json.load(f)
                         for entry in content['data']['districts']:
-                            data.append({
+                            record = {
                                 'State': state,
                                 'Year': year,
-                                'Quarter': file.strip('.json'),
+                                'Quarter': os.path.splitext(file)[0],
                                 'District': entry['name'],
                                 'RegisteredUsers': entry['registeredUsers']
-                            })
+                            }
+                            profile.add(record)
+                            data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Top_user', con=engine, if_exists='replace', index=False)
@@ -274,6 +306,7 @@ def parse_top_user():
 def parse_top_insurance():
     path = os.path.join(base_path, 'top/insurance/country/india/state')
     data = []
+    profile = run_profile.table('Top_insurance')
 
     for state in tqdm(os.listdir(path)):
         for year in os.listdir(os.path.join(path, state)):
@@ -282,19 +315,164 @@ def parse_top_insurance():
                     with open(os.path.join(path, state, year, file)) as f:
                         content = json.load(f)
                         for entry in content['data']['districts']:
-                            data.append({
+                            record = {
                                 'State': state,
                                 'Year': year,
-                                'Quarter': file.strip('.json'),
+                                'Quarter': os.path.splitext(file)[0],
                                 'District': entry['entityName'],
                                 'Count': entry['metric']['count'],
                                 'Amount': entry['metric']['amount']
-                            })
+                            }
+                            profile.add(record)
+                            data.append(record)
 
     df = pd.DataFrame(data)
     df.to_sql('Top_insurance', con=engine, if_exists='replace', index=False)
     return df
 
+# Country-level (national) files
+# Pulse publishes country/india/{year}/{quarter}.json next to the state folders.
+# These are ingested as their own partitions so all-India views don't have to
+# sum 36 states.  Transaction and insurance files share a layout, so their
+# parsers take the kind ('transaction' or 'insurance'); user files get their own.
+
+def _country_files(path):
+    for year in sorted(os.listdir(path)):
+        if not year.isdigit():  # skip the 'state' folder
+            continue
+        for file in sorted(os.listdir(os.path.join(path, year))):
+            if file.endswith(".json"):
+                with open(os.path.join(path, year, file)) as f:
+                    yield year, os.path.splitext(file)[0], json.load(f)
+
+def parse_country_aggregated(kind):
+    path = os.path.join(base_path, f'aggregated/{kind}/country/india')
+    data = []
+    profile = run_profile.table(f'Country_aggregated_{kind}')
+
+    for year, quarter, content in tqdm(_country_files(path)):
+        for txn in content['data']['transactionData']:
+            record = {
+                'Year': year,
+                'Quarter': quarter,
+                'Transaction_type': txn['name'],
+                'Count': txn['paymentInstruments'][0]['count'],
+                'Amount': txn['paymentInstruments'][0]['amount']
+            }
+            profile.add(record)
+            data.append(record)
+
+    df = pd.DataFrame(data)
+    df.to_sql(f'Country_aggregated_{kind}', con=engine, if_exists='replace', index=False)
+    return df
+
+def parse_country_aggregated_user():
+    path = os.path.join(base_path, 'aggregated/user/country/india')
+    data = []
+    profile = run_profile.table('Country_aggregated_user')
+
+    for year, quarter, content in tqdm(_country_files(path)):
+        for user in content['data']['usersByDevice'] or []:
+            record = {
+                'Year': year,
+                'Quarter': quarter,
+                'Brand': user['brand'],
+                'Count': user['count'],
+                'Percentage': user['percentage']
+            }
+            profile.add(record)
+            data.append(record)
+
+    df = pd.DataFrame(data)
+    df.to_sql('Country_aggregated_user', con=engine, if_exists='replace', index=False)
+    return df
+
+# The national hover files list one entry per state, e.g. "andaman & nicobar islands";
+# slugify them to match the state folder names used everywhere else.
+
+def parse_country_map(kind):
+    path = os.path.join(base_path, f'map/{kind}/hover/country/india')
+    data = []
+    profile = run_profile.table(f'Country_map_{kind}')
+
+    for year, quarter, content in tqdm(_country_files(path)):
+        for entry in content['data']['hoverDataList']:
+            record = {
+                'State': entry['name'].replace(' ', '-'),
+                'Year': year,
+                'Quarter': quarter,
+                'Count': entry['metric'][0]['count'],
+                'Amount': entry['metric'][0]['amount']
+            }
+            profile.add(record)
+            data.append(record)
+
+    df = pd.DataFrame(data)
+    df.to_sql(f'Country_map_{kind}', con=engine, if_exists='replace', index=False)
+    return df
+
+def parse_country_map_user():
+    path = os.path.join(base_path, 'map/user/hover/country/india')
+    data = []
+    profile = run_profile.table('Country_map_user')
+
+    for year, quarter, content in tqdm(_country_files(path)):
+        for name, entry in content['data']['hoverData'].items():
+            record = {
+                'State': name.replace(' ', '-'),
+                'Year': year,
+                'Quarter': quarter,
+                'RegisteredUsers': entry['registeredUsers'],
+                'AppOpens': entry.get('appOpens', None)
+            }
+            profile.add(record)
+            data.append(record)
+
+    df = pd.DataFrame(data)
+    df.to_sql('Country_map_user', con=engine, if_exists='replace', index=False)
+    return df
+
+def parse_country_top(kind):
+    path = os.path.join(base_path, f'top/{kind}/country/india')
+    data = []
+    profile = run_profile.table(f'Country_top_{kind}')
+
+    for year, quarter, content in tqdm(_country_files(path)):
+        for entry in content['data']['districts']:
+            record = {
+                'Year': year,
+                'Quarter': quarter,
+                'District': entry['entityName'],
+                'Count': entry['metric']['count'],
+                'Amount': entry['metric']['amount']
+            }
+            profile.add(record)
+            data.append(record)
+
+    df = pd.DataFrame(data)
+    df.to_sql(f'Country_top_{kind}', con=engine, if_exists='replace', index=False)
+    return df
+
+def parse_country_top_user():
+    path = os.path.join(base_path, 'top/user/country/india')
+    data = []
+    profile = run_profile.table('Country_top_user')
+
+    for year, quarter, content in tqdm(_country_files(path)):
+        for entry in content['data']['districts']:
+            record = {
+                'Year': year,
+                'Quarter': quarter,
+                'District': entry['name'],
+                'RegisteredUsers': entry['registeredUsers']
+            }
+            profile.add(record)
+            data.append(record)
+
+    df = pd.DataFrame(data)
+    df.to_sql('Country_top_user', con=engine, if_exists='replace', index=False)
+    return df
+
 df1 = parse_aggregated_transaction()
 df2 = parse_aggregated_user()
 df3 = parse_aggregated_insurance()
@@ -305,6 +483,50 @@ df7 = parse_top_user()
 df8 = parse_top_transaction()
 df9 = parse_top_insurance()
 
+# National partitions, keyed by the state-level CSV they summarise
+national_frames = {
+    'aggregated_transaction.csv': parse_country_aggregated('transaction'),
+    'aggregated_user.csv': parse_country_aggregated_user(),
+    'aggregated_insurance.csv': parse_country_aggregated('insurance'),
+    'map_transaction.csv': parse_country_map('transaction'),
+    'map_user.csv': parse_country_map_user(),
+    'map_insurance.csv': parse_country_map('insurance'),
+    'top_transaction.csv': parse_country_top('transaction'),
+    'top_user.csv': parse_country_top_user(),
+    'top_insurance.csv': parse_country_top('insurance'),
+}
+
+# Save the quality report for this run and stop before publishing anything if it fails
+output_dir = "."
+run_profile.save(os.path.join(output_dir, 'quality_report.json'))
+run_profile.check(quality_thresholds)
+
+# Step 3: Export base tables for the dashboard and refresh the derived df_* tables
+# Only the df_*.csv files whose inputs changed are recomputed.
+base_frames = {
+    'Aggregated_transaction': df1,
+    'Aggregated_user': df2,
+    'Aggregated_insurance': df3,
+    'Map_user': df4,
+    'Map_map': df5,
+    'Map_insurance': df6,
+    'Top_user': df7,
+    'Top_map': df8,
+    'Top_insurance': df9,
+}
+for table, df in base_frames.items():
+    df.to_csv(os.path.join(output_dir, BASE_TABLES[table]), index=False)
+print(refresh_derived_tables(output_dir))
+
+for filename, df in national_frames.items():
+    df.to_csv(os.path.join(output_dir, NATIONAL_TABLES[filename]), index=False)
+
+# Flag where the sum of states diverges from Pulse's national figure
+print(check_national_consistency(output_dir))
+
+# Publish the new data version last; running dashboards hot-reload on it
+print("Data version:", write_version(output_dir))
+
 
 
 
@@ -348,52 +570,26 @@ print("Shape of df9:", df9.shape)
 """### Dataset Information"""
 
 # Dataset Info
-# Dataset Info
-print("Info for df1:")
-df1.info()
-print("\nInfo for df2:")
-df2.info()
-print("\nInfo for df3:")
-df3.info()
-print("\nInfo for df4:")
-df4.info()
-print("\nInfo for df5:")
-df5.info()
-print("\nInfo for df6:")
-df6.info()
-print("\nInfo for df7:")
-df7.info()
-print("\nInfo for df8:")
-df8.info()
-print("\nInfo for df9:")
-df9.info()
+# Column types and non-null counts from the ingestion profile; no df.info() pass over df1-df9
+quality = run_profile.report()['tables']
+for table, p in quality.items():
+    info = pd.DataFrame({'Non-Null Count': {col: p['rows'] - n for col, n in p['nulls'].items()},
+                         'Dtype': {col: 'numeric' if col in p['numeric'] else 'string' for col in p['nulls']}})
+    print(f"\nInfo for {table} ({p['rows']} rows):\n", info)
 
 """#### Duplicate Values"""
 
 # Dataset Duplicate Value Count
-print("Duplicate count for df1:", df1.duplicated().sum())
-print("Duplicate count for df2:", df2.duplicated().sum())
-print("Duplicate count for df3:", df3.duplicated().sum())
-print("Duplicate count for df4:", df4.duplicated().sum())
-print("Duplicate count for df5:", df5.duplicated().sum())
-print("Duplicate count for df6:", df6.duplicated().sum())
-print("Duplicate count for df7:", df7.duplicated().sum())
-print("Duplicate count for df8:", df8.duplicated().sum())
-print("Duplicate count for df9:", df9.duplicated().sum())
+# Counted while parsing (rows repeating a table's key columns); no extra pass over df1-df9
+for table, p in quality.items():
+    print(f"Duplicate keys for {table}:", p['duplicate_keys'])
 
 """#### Missing Values/Null Values"""
 
 # Missing Values/Null Values Count
 
-print("Missing values for df1:\n", df1.isnull().sum())
-print("\nMissing values for df2:\n", df2.isnull().sum())
-print("\nMissing values for df3:\n", df3.isnull().sum())
-print("\nMissing values for df4:\n", df4.isnull().sum())
-print("\nMissing values for df5:\n", df5.isnull().sum())
-print("\nMissing values for df6:\n", df6.isnull().sum())
-print("\nMissing values for df7:\n", df7.isnull().sum())
-print("\nMissing values for df8:\n", df8.isnull().sum())
-print("\nMissing values for df9:\n", df9.isnull().sum())
+for table, p in quality.items():
+    print(f"\nMissing values for {table}:\n", pd.Series(p['nulls']))
 
 # Visualizing the missing values
 
@@ -411,16 +607,16 @@ print("\nMissing values for df9:\n", df9.isnull().sum())
 """
 
 # Dataset Describe
+# count/min/max/mean and quantile sketches from the ingestion profile
+
+for table, p in quality.items():
+    stats = pd.DataFrame({col: {'count': n['count'], 'mean': n['mean'], 'min': n['min'], **n['quantiles'], 'max': n['max']}
+                          for col, n in p['numeric'].items()})
+    print(f"\nDescription for {table}:\n", stats)
 
-print("Description for df1:\n", df1.describe())
-print("\nDescription for df2:\n", df2.describe())
-print("\nDescription for df3:\n", df3.describe())
-print("\nDescription for df4:\n", df4.describe())
-print("\nDescription for df5:\n", df5.describe())
-print("\nDescription for df6:\n", df6.describe())
-print("\nDescription for df7:\n", df7.describe())
-print("\nDescription for df8:\n", df8.describe())
-print("\nDescription for df9:\n", df9.describe())
+# Quarter completeness and schema checks (e.g. mangled quarter names)
+for table, p in quality.items():
+    print(f"{table}: {len(p['missing_quarters'])} state/years missing quarters, schema errors: {p['schema_errors'] or 'none'}")
 
 """### Buisness case study"""
 
@@ -428,19 +624,8 @@ print("\nDescription for df9:\n", df9.describe())
 # Goal: Understand how payment types perform over time across states.
 
 # @title Default title text
-query_transaction_dynamics = '''
-SELECT
-    State,
-    Year,
-    Quarter,
-    Transaction_type,
-    SUM(Count) AS Total_Transactions,
-    SUM(Amount) AS Total_Amount
-FROM Aggregated_transaction
-GROUP BY State, Year, Quarter, Transaction_type
-ORDER BY Year, Quarter
-'''
-df_transaction_dynamics = pd.read_sql_query(query_transaction_dynamics, engine)
+# Derived tables were refreshed in Step 3; read them instead of re-running the queries
+df_transaction_dynamics = pd.read_csv(os.path.join(output_dir, NODES['df_transaction_dynamics'].filename))
 
 df_transaction_dynamics
 
@@ -461,19 +646,7 @@ plt.show()
 # Device Dominance & User Engagement
 # Goal: Discover which mobile brands lead in user registration and engagement.
 
-query_device_dominance = '''
-SELECT
-    State,
-    Year,
-    Quarter,
-    Brand,
-    SUM(Count) AS Registered_Users,
-    ROUND(AVG(Percentage), 2) AS Avg_Percentage
-FROM Aggregated_user
-GROUP BY State, Year, Quarter, Brand
-ORDER BY Registered_Users DESC
-'''
-df_device_dominance = pd.read_sql_query(query_device_dominance, engine)
+df_device_dominance = pd.read_csv(os.path.join(output_dir, NODES['df_device_dominance'].filename))
 
 df_device_dominance.head(10)
 
@@ -501,19 +674,7 @@ plt.show()
 # Insurance Penetration & Growth Potential
 # Goal: Analyze growth and penetration of insurance transactions.
 
-query_insurance_growth = '''
-SELECT
-    State,
-    Year,
-    Quarter,
-    Transaction_type,
-    SUM(Count) AS Insurance_Count,
-    SUM(Amount) AS Insurance_Amount
-FROM Aggregated_insurance
-GROUP BY State, Year, Quarter, Transaction_type
-ORDER BY Year, Quarter
-'''
-df_insurance_growth = pd.read_sql_query(query_insurance_growth, engine)
+df_insurance_growth = pd.read_csv(os.path.join(output_dir, NODES['df_insurance_growth'].filename))
 
 df_insurance_growth.head(10)
 
@@ -540,21 +701,8 @@ plt.show()
 # User Engagement and Growth Strategy
 # Goal: Evaluate app usage vs. registered users.
 
-query_user_engagement = '''
-SELECT
-    State,
-    SUM(RegisteredUsers) AS Total_Users,
-    SUM(AppOpens) AS Total_AppOpens
-FROM Map_user
-GROUP BY State
-ORDER BY Total_AppOpens DESC
-'''
-df_user_engagement = pd.read_sql_query(query_user_engagement, engine)
-
-
-
-# Add Engagement Ratio column
-df_user_engagement['Engagement_Ratio'] = df_user_engagement['Total_AppOpens'] / df_user_engagement['Total_Users']
+# Engagement_Ratio (app opens per registered user) is added by the node's post step
+df_user_engagement = pd.read_csv(os.path.join(output_dir, NODES['df_user_engagement'].filename))
 
 # Top 10 Engaged States
 top_engaged = df_user_engagement.sort_values('Engagement_Ratio', ascending=False).head(10)
@@ -569,18 +717,7 @@ plt.show()
 # Transaction Analysis Across States and Districts
 # Goal: Identify top-performing areas by transaction value.
 
-query_transaction_by_district = '''
-SELECT
-    State,
-    District,
-    SUM(Amount) AS Total_Amount,
-    SUM(Count) AS Total_Transactions
-FROM Top_map
-GROUP BY State, District
-ORDER BY Total_Amount DESC
-LIMIT 20
-'''
-df_top_districts = pd.read_sql_query(query_transaction_by_district, engine)
+df_top_districts = pd.read_csv(os.path.join(output_dir, NODES['df_top_districts'].filename))
 
 df_top_districts
 
@@ -0,0 +1,161 @@
+"""Prerendered static snapshot of every dashboard view.
+
+Every page x year x quarter x state x transaction type combination is
+rendered once across a process pool and written as plain JSON that any
+static web server can host.  Filters a page ignores are collapsed first, so
+e.g. the Map page is rendered once per (year, quarter, state).
+
+    python snapshot.py --out snapshot -j 8
+
+Layout of ``--out``:
+
+    index.json              filter options, page filters and {view key: view id}
+    views/<id>.json         subheader + blocks; charts point at figure ids
+    figures/<id>.json       Plotly figure JSON, stored once however many views share it
+    templates/<id>.json     Plotly layout templates; figures name theirs by id
+    assets/india_states.geojson
+    index.html              viewer: fetches the JSON and draws it with plotly.js
+
+Ids are content hashes, so identical views and figures are deduplicated and
+files from an earlier snapshot can be left in place.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from data_store import load_dataset
+from views import PAGES, PAGE_FILTERS, Filters, canonical, filter_options, render_view
+
+# Charts reference the GeoJSON by URL (relative to index.html) instead of
+# embedding 1 MB of borders in every map figure.
+GEOJSON_URL = "assets/india_states.geojson"
+
+_data = None
+
+
+def _init_worker(data_dir):
+    global _data
+    _data = load_dataset(data_dir)
+
+
+def _content_id(payload):
+    return hashlib.sha256(payload).hexdigest()[:20]
+
+
+def view_key(page, f):
+    return "|".join([page, *(str(v) for v in f)])
+
+
+def _split_template(fig):
+    """Figure JSON with ``layout.template`` replaced by its id, plus ``(id, template JSON)``.
+
+    The template is ~90% of a typical figure and identical across figures, so
+    it is stored once under templates/ and figures deduplicate on the rest.
+    """
+    fig = json.loads(fig.to_json())
+    template = json.dumps(fig["layout"].pop("template", {}), separators=(",", ":")).encode()
+    template_id = _content_id(template)
+    fig["layout"]["template"] = template_id
+    return json.dumps(fig, separators=(",", ":")).encode(), (template_id, template)
+
+
+def _render(job):
+    """Render one view; returns ``(key, view id, view JSON, {figure id: figure JSON}, {template id: JSON})``."""
+    page, f = job
+    subheader, blocks = render_view(_data, page, f, GEOJSON_URL)
+    figures, templates, out = {}, {}, []
+    for kind, payload in blocks:
+        if kind == "chart":
+            fig_json, (template_id, template) = _split_template(payload)
+            templates[template_id] = template
+            fig_id = _content_id(fig_json)
+            figures[fig_id] = fig_json
+            payload = fig_id
+        out.append([kind, payload])
+    view_json = json.dumps({"subheader": subheader, "blocks": out}, ensure_ascii=False).encode()
+    return view_key(page, f), _content_id(view_json), view_json, figures, templates
+
+
+def enumerate_views(data):
+    """Every distinct (page, filters) the dashboard can show, after collapsing unused filters."""
+    years, quarters, states, txn_types = filter_options(data)
+    seen = set()
+    for page in PAGES:
+        for year in years:
+            for quarter in quarters:
+                for state in states:
+                    for txn_type in txn_types:
+                        f = canonical(page, Filters(year, quarter, state, txn_type))
+                        if (page, f) not in seen:
+                            seen.add((page, f))
+                            yield page, f
+
+
+def _write_atomic(path, payload):
+    tmp = f"{path}.tmp.{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def _write_once(path, payload):
+    if os.path.exists(path):
+        return False
+    _write_atomic(path, payload)
+    return True
+
+
+def export(out_dir="snapshot", data_dir=".", max_workers=None, chunksize=16):
+    """Render every view into ``out_dir``; returns counts of views and files written."""
+    data = load_dataset(data_dir)
+    jobs = list(enumerate_views(data))
+    for sub in ("views", "figures", "templates", "assets"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+
+    index, stats = {}, {"views": len(jobs), "view_files": 0, "figure_files": 0, "template_files": 0}
+    with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+        for key, view_id, view_json, figures, templates in pool.map(_render, jobs, chunksize=chunksize):
+            index[key] = view_id
+            stats["view_files"] += _write_once(os.path.join(out_dir, "views", f"{view_id}.json"), view_json)
+            for fig_id, fig_json in figures.items():
+                stats["figure_files"] += _write_once(os.path.join(out_dir, "figures", f"{fig_id}.json"), fig_json)
+            for template_id, template in templates.items():
+                stats["template_files"] += _write_once(os.path.join(out_dir, "templates", f"{template_id}.json"), template)
+
+    shutil.copyfile(os.path.join(data_dir, "india_states.geojson.txt"),
+                    os.path.join(out_dir, GEOJSON_URL))
+    shutil.copyfile(os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot_viewer.html"),
+                    os.path.join(out_dir, "index.html"))
+
+    years, quarters, states, txn_types = filter_options(data)
+    manifest = {
+        "version": data.version,
+        "pages": PAGES,
+        "page_filters": PAGE_FILTERS,
+        "options": {
+            "year": years,
+            "quarter": quarters,
+            "state": states,
+            "txn_type": txn_types,
+        },
+        "views": index,
+    }
+    # index.json goes last so a server never points at views that aren't written yet
+    _write_atomic(os.path.join(out_dir, "index.json"), json.dumps(manifest, ensure_ascii=False).encode())
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a static snapshot of every dashboard view.")
+    parser.add_argument("--out", default="snapshot")
+    parser.add_argument("--data-dir", default=".")
+    parser.add_argument("-j", "--jobs", type=int, default=None)
+    args = parser.parse_args()
+
+    stats = export(args.out, args.data_dir, args.jobs)
+    print(f"{stats['views']} views rendered; wrote {stats['view_files']} view files, "
+          f"{stats['figure_files']} figure files and {stats['template_files']} template files to {args.out}/")
@@ -0,0 +1,125 @@
+import asyncio
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from api import QueryAPI
+from data_store import Dataset, load_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class StaticStore:
+    """A store that always serves one dataset loaded from the bundled CSVs."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def current(self):
+        return self.data
+
+
+@pytest.fixture(scope="module")
+def api():
+    return QueryAPI(StaticStore(load_dataset(ROOT)))
+
+
+def test_totals_match_csv(api):
+    status, headers, body = api.handle("GET", "/totals?year=2022&quarter=1&state=kerala", {})
+    assert status == 200
+    assert headers["Content-Type"].startswith("application/json")
+
+    df = pd.read_csv(os.path.join(ROOT, "aggregated_transaction.csv"))
+    df = df[(df.Year == 2022) & (df.Quarter == 1) & (df.State == "kerala")]
+    payload = json.loads(body)
+    assert payload["filters"] == {"year": 2022, "quarter": 1, "state": "kerala", "txn_type": "All"}
+    assert payload["data"]["Total_Transactions"] == df["Count"].sum()
+    assert payload["data"]["Total_Amount"] == pytest.approx(df["Amount"].sum())
+    assert payload["data"]["Transaction_Types"] == df["Transaction_type"].nunique()
+
+
+def test_filter_options_are_computed_once_per_dataset(api):
+    data = api.store.current()
+    years, quarters, _, _ = data.filter_options
+    assert data.filter_options is data.filter_options
+    assert all(type(y) is int for y in years)
+    assert all(type(q) is int for q in quarters[1:])
+
+
+def test_matching_etag_returns_304(api):
+    _, headers, _ = api.handle("GET", "/states?year=2022", {})
+    status, headers_304, body = api.handle("GET", "/states?year=2022", {"if-none-match": headers["ETag"]})
+    assert status == 304
+    assert body == b""
+    assert headers_304["ETag"] == headers["ETag"]
+
+    status, _, _ = api.handle("GET", "/states?year=2022", {"if-none-match": '"stale"'})
+    assert status == 200
+
+
+def test_unchanged_result_returns_304_across_versions(api):
+    old = api.store.current()
+    status, headers, _ = api.handle("GET", "/states?year=2021", {})
+    assert status == 200
+    assert headers["X-Data-Version"] == old.version
+
+    # A refresh that leaves these tables as they were
+    store = StaticStore(Dataset("v2", old.tables, old.national, old.dictionary))
+    refreshed = QueryAPI(store)
+    status, headers_v2, body = refreshed.handle("GET", "/states?year=2021", {"if-none-match": headers["ETag"]})
+    assert status == 304
+    assert body == b""
+    assert headers_v2["X-Data-Version"] == "v2"
+
+
+@pytest.mark.parametrize("query", ["year=1999", "year=abc", "year=2022&state=nowhere", "quarter=7"])
+def test_bad_filters_return_400(api, query):
+    status, _, body = api.handle("GET", f"/totals?{query}", {})
+    assert status == 400
+    assert "error" in json.loads(body)
+
+
+def test_unknown_path_returns_404(api):
+    status, _, _ = api.handle("GET", "/nope", {})
+    assert status == 404
+
+
+def test_post_returns_405(api):
+    status, headers, _ = api.handle("POST", "/totals", {})
+    assert status == 405
+    assert headers["Allow"] == "GET, HEAD"
+
+
+async def _roundtrip(api, raw):
+    server = await asyncio.start_server(api.serve_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=5)
+    writer.close()
+    server.close()
+    await server.wait_closed()
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.decode().split("\r\n")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return int(lines[0].split()[1]), headers, body
+
+
+def test_head_has_content_length_and_no_body(api):
+    _, _, get_body = api.handle("GET", "/brands?year=2021", {})
+    status, headers, body = asyncio.run(_roundtrip(
+        api, b"HEAD /brands?year=2021 HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n"))
+    assert status == 200
+    assert int(headers["Content-Length"]) == len(get_body)
+    assert body == b""
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5", b"99999999"])
+def test_invalid_content_length_returns_400_and_closes(api, length):
+    status, headers, _ = asyncio.run(_roundtrip(
+        api, b"GET /totals HTTP/1.1\r\nHost: x\r\nContent-Length: " + length + b"\r\n\r\n"))
+    assert status == 400
+    assert headers["Connection"] == "close"
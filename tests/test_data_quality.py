@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from data_quality import DataQualityError, QuantileSketch, RunProfile, TableProfile
+
+
+def _record(state, year, quarter, district, users):
+    return {'State': state, 'Year': year, 'Quarter': quarter, 'District': district, 'RegisteredUsers': users}
+
+
+def test_quantile_sketch_rank_error():
+    n = 100_000
+    values = list(range(n))
+    random.Random(0).shuffle(values)
+    sketch = QuantileSketch()
+    for v in values:
+        sketch.add(v)
+
+    qs = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    for q, estimate in zip(qs, sketch.quantiles(qs)):
+        assert abs(estimate / n - q) < 0.02, (q, estimate)
+    assert sum(len(level) for level in sketch.levels) < 2_000
+
+
+def test_merged_profiles_match_single_profile():
+    records = [_record(state, str(year), str(q), f"d{d}", year * 10 + q + d)
+               for state in ("goa", "kerala") for year in (2021, 2022) for q in (1, 2, 3, 4) for d in range(3)]
+    # Keys seen by both workers are duplicates, as are repeats within one worker
+    worker_a = records[:30] + records[40:42] + [records[0]]
+    worker_b = records[30:] + records[40:42]
+    combined = worker_a + worker_b
+
+    single = TableProfile('Top_user')
+    for record in combined:
+        single.add(record)
+
+    merged, other = TableProfile('Top_user'), TableProfile('Top_user')
+    for record in worker_a:
+        merged.add(record)
+    for record in worker_b:
+        other.add(record)
+    merged.merge(other)
+
+    assert merged.duplicate_keys == single.duplicate_keys == 5
+    a, b = merged.report(), single.report()
+    for field in ('rows', 'nulls', 'duplicate_keys', 'missing_quarters', 'schema_errors'):
+        assert a[field] == b[field], field
+    for stat in ('count', 'min', 'max', 'mean'):
+        assert a['numeric']['RegisteredUsers'][stat] == pytest.approx(b['numeric']['RegisteredUsers'][stat])
+
+
+def test_mangled_quarter_is_a_schema_error():
+    profile = TableProfile('Top_user')
+    profile.add(_record('goa', '2022', '1', 'north goa', 5))
+    # what str.strip('.json') would leave of a file named "son.json"
+    profile.add(_record('goa', '2022', '', 'south goa', 5))
+
+    report = profile.report()
+    assert report['schema_errors'] == {'bad_quarter': 1}
+    assert report['schema_error_examples'] == {'bad_quarter': ['']}
+
+
+def test_check_raises_on_threshold_violations():
+    run = RunProfile()
+    profile = run.table('Top_user')
+    profile.add(_record('goa', '2022', '1', 'north goa', 5))
+    run.check()  # clean run passes
+
+    profile.add(_record('goa', '2022', '1', 'north goa', 6))
+    profile.add(_record('goa', '2022', '9', 'south goa', 'n/a'))
+    with pytest.raises(DataQualityError) as exc:
+        run.check()
+    violations = exc.value.violations
+    assert any('duplicate keys' in v for v in violations)
+    assert any('schema errors' in v for v in violations)
+
+    run.check({'max_schema_errors': None, 'max_duplicate_keys': None})
@@ -0,0 +1,67 @@
+import os
+import shutil
+import time
+
+import pytest
+
+from data_store import DataStore, load_dataset, validate_dataset, write_version
+from derived_tables import BASE_TABLES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for filename in BASE_TABLES.values():
+        shutil.copy(os.path.join(ROOT, filename), tmp_path)
+    write_version(str(tmp_path), "v1")
+    return str(tmp_path)
+
+
+def _wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.mark.parametrize("line", ["garbage\n", "goa,2024,1,Peer-to-peer payments,many,1.0\n"])
+def test_malformed_row_fails_validation(data_dir, line):
+    with open(os.path.join(data_dir, "aggregated_transaction.csv"), "a") as f:
+        f.write(line)
+    with pytest.raises(ValueError, match="aggregated_transaction.csv"):
+        validate_dataset(load_dataset(data_dir))
+
+
+def test_empty_table_fails_validation(data_dir):
+    path = os.path.join(data_dir, "top_user.csv")
+    with open(path) as f:
+        header = f.readline()
+    with open(path, "w") as f:
+        f.write(header)
+    with pytest.raises(ValueError, match="top_user.csv: no rows"):
+        validate_dataset(load_dataset(data_dir))
+
+
+def test_invalid_version_is_not_swapped_in(data_dir):
+    path = os.path.join(data_dir, "aggregated_transaction.csv")
+    with open(path) as f:
+        good = f.read()
+
+    store = DataStore(data_dir, poll_interval=0.02)
+    try:
+        assert store.current().version == "v1"
+        with open(path, "a") as f:
+            f.write("garbage\n")
+        write_version(data_dir, "v2")
+        time.sleep(1)
+        assert store.current().version == "v1"
+
+        with open(path, "w") as f:
+            f.write(good)
+        write_version(data_dir, "v3")
+        assert _wait_for(lambda: store.current().version == "v3")
+    finally:
+        store.stop()
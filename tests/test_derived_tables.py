@@ -0,0 +1,94 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import derived_tables
+from derived_tables import BASE_TABLES, NODES, Node, refresh, stale_nodes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for filename in BASE_TABLES.values():
+        shutil.copy(os.path.join(ROOT, filename), tmp_path)
+    return str(tmp_path)
+
+
+def _append_copy_of_first_row(path):
+    df = pd.read_csv(path)
+    pd.concat([df, df.head(1)]).to_csv(path, index=False)
+
+
+def test_only_nodes_reading_an_edited_table_are_rebuilt(data_dir):
+    assert set(refresh(data_dir).values()) == {"rebuilt"}
+    assert set(refresh(data_dir).values()) == {"fresh"}
+
+    _append_copy_of_first_row(os.path.join(data_dir, "map_user.csv"))
+    assert stale_nodes(data_dir) == ["df_user_engagement"]
+    status = refresh(data_dir)
+    assert status.pop("df_user_engagement") == "rebuilt"
+    assert set(status.values()) == {"fresh"}
+
+
+def test_missing_output_is_stale(data_dir):
+    refresh(data_dir)
+    os.remove(os.path.join(data_dir, "df_top_districts.csv"))
+    assert stale_nodes(data_dir) == ["df_top_districts"]
+
+
+def test_changing_a_post_step_makes_its_node_stale(data_dir, monkeypatch):
+    refresh(data_dir)
+
+    def rounded_ratio(df):
+        df['Engagement_Ratio'] = (df['Total_AppOpens'] / df['Total_Users']).round(2)
+        return df
+
+    monkeypatch.setattr(NODES["df_user_engagement"], "post", rounded_ratio)
+    assert stale_nodes(data_dir) == ["df_user_engagement"]
+
+
+def test_code_fingerprint_without_source():
+    # Functions built by exec have no source file; fall back to the bytecode
+    namespace = {}
+    exec("def a(df):\n    return df + 1\n\ndef b(df):\n    return df + 2\n", namespace)
+    assert derived_tables._code_fingerprint(namespace["a"]) != derived_tables._code_fingerprint(namespace["b"])
+
+
+def test_dependent_node_waits_for_its_input(data_dir, monkeypatch):
+    monkeypatch.setitem(NODES, "df_top_states", Node("df_top_states", ["df_top_districts"], '''
+SELECT State, SUM(Total_Amount) AS Total_Amount
+FROM df_top_districts
+GROUP BY State
+'''))
+    # On a first run df_top_districts.csv doesn't exist until its node finishes
+    status = refresh(data_dir, ["df_top_states"], max_workers=4)
+    assert status == {"df_top_districts": "rebuilt", "df_top_states": "rebuilt"}
+
+    _append_copy_of_first_row(os.path.join(data_dir, "top_transaction.csv"))
+    assert refresh(data_dir, ["df_top_states"]) == {"df_top_districts": "rebuilt", "df_top_states": "rebuilt"}
+    top = pd.read_csv(os.path.join(data_dir, "df_top_districts.csv"))
+    states = pd.read_csv(os.path.join(data_dir, "df_top_states.csv"))
+    assert states["Total_Amount"].sum() == pytest.approx(top["Total_Amount"].sum())
+
+
+def test_cycles_and_unknown_nodes_are_rejected(data_dir, monkeypatch):
+    monkeypatch.setitem(NODES, "df_a", Node("df_a", ["df_b"], "SELECT * FROM df_b"))
+    monkeypatch.setitem(NODES, "df_b", Node("df_b", ["df_a"], "SELECT * FROM df_a"))
+    with pytest.raises(ValueError, match="cycle"):
+        refresh(data_dir, ["df_a"])
+    with pytest.raises(KeyError, match="df_nope"):
+        refresh(data_dir, ["df_nope"])
+
+
+def test_failed_node_is_raised_and_its_dependents_skipped(data_dir, monkeypatch):
+    monkeypatch.setitem(NODES, "df_broken", Node("df_broken", ["Map_user"], "SELECT no_such_column FROM Map_user"))
+    monkeypatch.setitem(NODES, "df_after_broken", Node("df_after_broken", ["df_broken"], "SELECT * FROM df_broken"))
+
+    with pytest.raises(Exception, match="no_such_column"):
+        refresh(data_dir, ["df_after_broken", "df_user_engagement"])
+    assert not os.path.exists(os.path.join(data_dir, "df_after_broken.csv"))
+    # Nodes that did build are recorded, so the retry only redoes the failed ones
+    assert stale_nodes(data_dir, ["df_user_engagement"]) == []
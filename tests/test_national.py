@@ -0,0 +1,41 @@
+import pandas as pd
+
+from national import check_consistency
+
+KEYS = ["Year", "Quarter", "Transaction_type"]
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=KEYS + ["Count", "Amount"])
+
+
+def test_matching_sums_are_consistent():
+    states = _frame([(2022, 1, "p2p", 60, 600.0), (2022, 1, "p2p", 40, 400.0)])
+    national = _frame([(2022, 1, "p2p", 100, 1000.0)])
+    assert check_consistency(states, national, KEYS, ["Count", "Amount"]).empty
+
+
+def test_divergent_row_is_reported():
+    states = _frame([(2022, 1, "p2p", 100, 1000.0), (2022, 1, "merchant", 50, 500.0)])
+    national = _frame([(2022, 1, "p2p", 100, 1002.0), (2022, 1, "merchant", 50, 560.0)])
+    diverged = check_consistency(states, national, KEYS, ["Count", "Amount"])
+    # p2p is within the default 0.5%; merchant is 10.7% short
+    assert diverged["Transaction_type"].tolist() == ["merchant"]
+    assert diverged["Amount_diff_pct"].iloc[0] == (500 - 560) / 560 * 100
+
+
+def test_key_on_one_side_only_is_reported():
+    states = _frame([(2022, 1, "p2p", 100, 1000.0), (2022, 1, "recharge", 5, 50.0)])
+    national = _frame([(2022, 1, "p2p", 100, 1000.0), (2022, 1, "financial", 7, 70.0)])
+    diverged = check_consistency(states, national, KEYS, ["Count", "Amount"]).set_index("Transaction_type")
+    assert sorted(diverged.index) == ["financial", "recharge"]
+    assert pd.isna(diverged.loc["recharge", "Count_national"])
+    assert pd.isna(diverged.loc["financial", "Count_states"])
+
+
+def test_zero_national_value():
+    states = _frame([(2022, 1, "p2p", 0, 0.0), (2022, 2, "p2p", 3, 30.0)])
+    national = _frame([(2022, 1, "p2p", 0, 0.0), (2022, 2, "p2p", 0, 0.0)])
+    diverged = check_consistency(states, national, KEYS, ["Count", "Amount"])
+    # 0 vs 0 agrees; anything against a national zero diverges
+    assert diverged["Quarter"].tolist() == [2]
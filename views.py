@@ -0,0 +1,263 @@
+"""Dashboard pages as plain functions of (dataset, filters).
+
+``streamlit_app.py`` draws the blocks returned by ``render_view``; the static
+snapshot exporter renders the same blocks without Streamlit.  The
+aggregations behind each page are separate functions so other consumers
+can reuse the exact numbers the dashboard shows.
+"""
+
+from collections import namedtuple
+
+import pandas as pd
+import plotly.express as px
+
+PAGES = ["Aggregated", "Map", "Top Leaders", "Users", "Insurance"]
+
+# Filters each page reads; the others don't change what it shows
+PAGE_FILTERS = {
+    "Aggregated": ("year", "quarter", "state", "txn_type"),
+    "Map": ("year", "quarter", "state"),
+    "Top Leaders": ("year", "quarter", "state"),
+    "Users": ("year", "quarter", "state"),
+    "Insurance": ("year", "quarter", "state"),
+}
+
+Filters = namedtuple("Filters", ["year", "quarter", "state", "txn_type"], defaults=["All", "All", "All"])
+
+# Correct state name mapping
+state_name_fix = {
+    "andaman-&-nicobar-islands": "Andaman & Nicobar",
+    "andhra-pradesh": "Andhra Pradesh",
+    "arunachal-pradesh": "Arunachal Pradesh",
+    "assam": "Assam",
+    "bihar": "Bihar",
+    "chandigarh": "Chandigarh",
+    "chhattisgarh": "Chhattisgarh",
+    "dadra-&-nagar-haveli-&-daman-&-diu": "Dadra and Nagar Haveli and Daman and Diu",
+    "delhi": "Delhi",
+    "goa": "Goa",
+    "gujarat": "Gujarat",
+    "haryana": "Haryana",
+    "himachal-pradesh": "Himachal Pradesh",
+    "jammu-&-kashmir": "Jammu & Kashmir",
+    "jharkhand": "Jharkhand",
+    "karnataka": "Karnataka",
+    "kerala": "Kerala",
+    "ladakh": "Ladakh",
+    "lakshadweep": "Lakshadweep",
+    "madhya-pradesh": "Madhya Pradesh",
+    "maharashtra": "Maharashtra",
+    "manipur": "Manipur",
+    "meghalaya": "Meghalaya",
+    "mizoram": "Mizoram",
+    "nagaland": "Nagaland",
+    "odisha": "Odisha",
+    "puducherry": "Puducherry",
+    "punjab": "Punjab",
+    "rajasthan": "Rajasthan",
+    "sikkim": "Sikkim",
+    "tamil-nadu": "Tamil Nadu",
+    "telangana": "Telangana",
+    "tripura": "Tripura",
+    "uttar-pradesh": "Uttar Pradesh",
+    "uttarakhand": "Uttarakhand",
+    "west-bengal": "West Bengal"
+}
+
+
+def filter_options(data):
+    """Sidebar choices: ``(years, quarters, states, transaction types)``.
+
+    Computed once per ``Dataset``; a new data version is a new ``Dataset``.
+    """
+    return data.filter_options
+
+
+def canonical(page, f):
+    """``f`` with the filters ``page`` ignores reset to their defaults."""
+    used = PAGE_FILTERS[page]
+    return Filters(*(value if name in used else "All" for name, value in zip(Filters._fields, f)))
+
+
+# All-India views read the national partition directly instead of summing states
+def source(data, filename, f):
+    if f.state == "All" and filename in data.national:
+        return data.national[filename]
+    return data[filename]
+
+
+# Helper to filter DataFrame
+def filter_df(df, f):
+    df = df[df['Year'] == f.year]
+    if f.quarter != "All":
+        df = df[df['Quarter'] == f.quarter]
+    if f.state != "All":
+        df = df[df['State'] == f.state]
+    return df
+
+
+# Page aggregations
+
+def transactions(data, f):
+    """Aggregated transaction rows for the filters, including transaction type."""
+    df_f = filter_df(source(data, "aggregated_transaction.csv", f), f)
+    if f.txn_type != "All":
+        df_f = df_f[df_f['Transaction_type'] == f.txn_type]
+    return df_f
+
+
+def totals(data, f):
+    df_f = transactions(data, f)
+    return {"Total_Transactions": int(df_f['Count'].sum()),
+            "Total_Amount": float(df_f['Amount'].sum()),
+            "Transaction_Types": int(df_f['Transaction_type'].nunique())}
+
+
+def type_breakdown(data, f):
+    df_f = transactions(data, f)
+    return df_f.groupby("Transaction_type", observed=True)[["Count", "Amount"]].sum().reset_index()
+
+
+def brand_share(data, f):
+    df_user = filter_df(source(data, "aggregated_user.csv", f), f)
+    return df_user.groupby("Brand", observed=True)["Count"].sum().sort_values(ascending=False).reset_index()
+
+
+def state_summary(data, f):
+    df_map = filter_df(source(data, "map_transaction.csv", f), f)
+    summary = df_map.groupby("State", observed=True)[["Count", "Amount"]].sum().reset_index()
+    summary.columns = ["State", "Total_Transactions", "Total_Amount"]
+    return summary
+
+
+def top_districts(data, f, n=10):
+    df_top = filter_df(source(data, "top_transaction.csv", f), f)
+    return df_top.groupby("District", observed=True)["Amount"].sum().nlargest(n).reset_index()
+
+
+def insurance_by_quarter(data, f):
+    df_ins_f = filter_df(source(data, "aggregated_insurance.csv", f), f)
+    return df_ins_f.groupby('Quarter', observed=True)["Amount"].sum().reset_index()
+
+
+# Pages. Each returns (subheader, blocks); a block is one of
+#   ("columns", [(label, value), ...])   metrics side by side
+#   ("metric", (label, value))
+#   ("chart", plotly figure)
+#   ("warning", text)
+
+def _aggregated(data, f, geojson):
+    blocks = []
+    df_f = transactions(data, f)
+    blocks.append(("columns", [
+        ("Total Transactions", f"{df_f['Count'].sum():,.0f}"),
+        ("Total Amount (₹)", f"₹{df_f['Amount'].sum()/1e7:.2f} Cr"),
+        ("Transaction Types", f"{df_f['Transaction_type'].nunique()}"),
+    ]))
+    blocks.append(("chart", px.bar(df_f, x="Transaction_type", y="Amount", color="Transaction_type",
+                                   title="Transaction Amount by Type")))
+
+    df_user = filter_df(source(data, "aggregated_user.csv", f), f)
+    if not df_user.empty:
+        blocks.append(("chart", px.pie(df_user, names='Brand', values='Count', title="User Brand Share")))
+    return "📊 Aggregated Insights", blocks
+
+
+def _map(data, f, geojson):
+    summary = state_summary(data, f)
+    if summary.empty:
+        return "🗺️ State-Wise Transaction Heatmap", [("warning", "⚠️ No map data available for selected filters.")]
+
+    summary["State"] = summary["State"].str.lower().map(state_name_fix)
+    fig = px.choropleth(
+        summary,
+        geojson=geojson,
+        featureidkey="properties.ST_NM",
+        locations="State",
+        color="Total_Transactions",
+        color_continuous_scale="plasma",
+        title="📍 State-wise Total Transactions",
+        hover_name="State",
+        labels={"Total_Transactions": "Total Transactions"}
+    )
+    fig.update_geos(fitbounds="locations", visible=False)
+    fig.update_layout(margin={"r":0,"t":30,"l":0,"b":0},
+                      geo=dict(bgcolor="rgba(0,0,0,0)"),
+                      paper_bgcolor="#0e1117",
+                      font_color="#f0f0f0")
+    return "🗺️ State-Wise Transaction Heatmap", [("chart", fig)]
+
+
+def _top_leaders(data, f, geojson):
+    top = top_districts(data, f)
+    if top.empty:
+        return "🥇 Top Performing Districts", [("warning", "No data available.")]
+    return "🥇 Top Performing Districts", [("chart", px.bar(top, x="District", y="Amount", color="Amount",
+                                                          title="Top 10 Districts by Transaction Amount"))]
+
+
+def _valid_locations(df, size):
+    df = df.dropna(subset=["Latitude", "Longitude", size])
+    df["Latitude"] = pd.to_numeric(df["Latitude"], errors="coerce")
+    df["Longitude"] = pd.to_numeric(df["Longitude"], errors="coerce")
+    return df.dropna(subset=["Latitude", "Longitude"])
+
+
+def _users(data, f, geojson):
+    df_user = filter_df(source(data, "aggregated_user.csv", f), f)
+    if df_user.empty:
+        return "📱 User Insights", [("warning", "No user data available.")]
+
+    blocks = [
+        ("metric", ("Total Users", f"{df_user['Count'].sum():,.0f}")),
+        ("metric", ("Most Used Brand", df_user.groupby('Brand', observed=True)['Count'].sum().idxmax())),
+        ("chart", px.bar(df_user, x="Brand", y="Count", color="Brand", title="User Brand Distribution")),
+    ]
+
+    df_map_user = filter_df(data["map_user.csv"], f)
+    if not df_map_user.empty and {'Latitude', 'Longitude'}.issubset(df_map_user.columns):
+        df_map_user = _valid_locations(df_map_user, "Count")
+        if not df_map_user.empty:
+            blocks.append(("chart", px.scatter_mapbox(df_map_user, lat="Latitude", lon="Longitude", size="Count", color="Count",
+                                                      mapbox_style="open-street-map", zoom=3, hover_name="District",
+                                                      title="District-wise App Opens")))
+        else:
+            blocks.append(("warning", "No valid map data."))
+    return "📱 User Insights", blocks
+
+
+def _insurance(data, f, geojson):
+    df_ins_f = filter_df(source(data, "aggregated_insurance.csv", f), f)
+    if df_ins_f.empty:
+        return "🛡️ Insurance Trends", [("warning", "No insurance data available.")]
+
+    blocks = [
+        ("metric", ("Total Premium Collected", f"₹{df_ins_f['Amount'].sum()/1e7:.2f} Cr")),
+        ("chart", px.line(insurance_by_quarter(data, f),
+                          x="Quarter", y="Amount", markers=True, title="Insurance Premium by Quarter")),
+    ]
+
+    df_map_ins_f = filter_df(data["map_insurance.csv"], f)
+    if not df_map_ins_f.empty and {'Latitude', 'Longitude'}.issubset(df_map_ins_f.columns):
+        df_map_ins_f = _valid_locations(df_map_ins_f, "Amount")
+        if not df_map_ins_f.empty:
+            blocks.append(("chart", px.scatter_mapbox(df_map_ins_f, lat="Latitude", lon="Longitude", size="Amount", color="Amount",
+                                                      mapbox_style="carto-positron", zoom=3, hover_name="District",
+                                                      title="District-wise Insurance Collection")))
+        else:
+            blocks.append(("warning", "No valid location data for insurance."))
+    return "🛡️ Insurance Trends", blocks
+
+
+_PAGES = {
+    "Aggregated": _aggregated,
+    "Map": _map,
+    "Top Leaders": _top_leaders,
+    "Users": _users,
+    "Insurance": _insurance,
+}
+
+
+def render_view(data, page, f, geojson):
+    """``(subheader, blocks)`` for ``page`` under filters ``f``."""
+    return _PAGES[page](data, f, geojson)